@@ -1,7 +1,8 @@
 import streamlit as st
-from itertools import combinations_with_replacement
-import re
-from typing import List, Tuple, Iterator, Dict, Any, Optional, Union
+import numpy as np
+from resistor_search import MAX_RESULTS_CAP, parse_resistance, combo_values, find_combinations, process_results
+from resistor_display import format_resistance, get_resistor_colors, color_bands_html, generate_circuit_dot
+from typing import Tuple, Dict, Optional, Union
 from datetime import datetime
 
 # --- Page Configuration ---
@@ -16,160 +17,85 @@ st.set_page_config(
 if 'results_calculated' not in st.session_state:
     st.session_state.results_calculated = False
 if 'series_results' not in st.session_state:
-    st.session_state.series_results = []
+    st.session_state.series_results = None
 if 'parallel_results' not in st.session_state:
-    st.session_state.parallel_results = []
+    st.session_state.parallel_results = None
+if 'series_total' not in st.session_state:
+    st.session_state.series_total = 0
+if 'parallel_total' not in st.session_state:
+    st.session_state.parallel_total = 0
+if 'search_query' not in st.session_state:
+    st.session_state.search_query = None
 if 'num_to_display' not in st.session_state:
     st.session_state.num_to_display = 5
 
 # --- Constants ---
-E12_VALUES = [10, 12, 15, 18, 22, 27, 33, 39, 47, 56, 68, 82]
-STANDARD_RESISTORS = sorted([j * 10**i for i in range(7) for j in E12_VALUES])
-MAX_RESISTORS_IN_COMBO = 4
 RESULTS_INCREMENT = 5
 
 # --- Helper Functions (Defined first) ---
 
-def parse_resistance(value: str) -> Optional[float]:
-    """Parses a resistance string (e.g., '4.7k') into a float."""
-    if not value: return None
-    pattern = r"^\s*(\d*\.?\d+)\s*([kmg])?\s*$"
-    match = re.match(pattern, value.strip(), re.IGNORECASE)
-    if not match: return None
-    number_str, prefix = match.groups()
-    number = float(number_str)
-    PREFIXES = {"k": 10**3, "m": 10**6, "g": 10**9}
-    multiplier = PREFIXES.get(prefix.lower() if prefix else "", 1)
-    return number * multiplier
-
-def format_resistance(value: float) -> str:
-    """Formats the resistance value with smart precision."""
-    if value >= 1_000_000:
-        val_str = f"{value / 1_000_000:.3f}".rstrip('0').rstrip('.')
-        return f"{val_str} MΩ"
-    if value >= 1_000:
-        val_str = f"{value / 1_000:.3f}".rstrip('0').rstrip('.')
-        return f"{val_str} kΩ"
-    return f"{int(value)} Ω"
-
-def get_resistor_colors(value: float) -> List[str]:
-    """Calculates the color bands for a given resistor value."""
-    COLOR_CODES = {0: 'black', 1: 'brown', 2: 'red', 3: 'orange', 4: 'yellow', 5: 'green', 6: 'blue', 7: 'purple', 8: 'gray', 9: 'white'}
-    if value == 0: return ['black', 'black', 'black']
-    try:
-        s_val = f"{value:.9E}"
-        parts = s_val.split('E')
-        mantissa_str, exponent = parts[0].replace('.', ''), int(parts[1])
-        d1, d2 = int(mantissa_str[0]), int(mantissa_str[1])
-        num_zeros = exponent - 1
-        return [COLOR_CODES.get(d, 'black') for d in [d1, d2, num_zeros]]
-    except (IndexError, ValueError): return ['black', 'black', 'black']
-
-def color_bands_html(colors: List[str]) -> str:
-    """Generates HTML for displaying color bands."""
-    return "".join(f'<div style="background-color:{c}; width:15px; height:40px; display:inline-block; border:1.5px solid #333; margin-right:2px; border-radius: 4px; vertical-align: middle;"></div>' for c in colors)
-
-def calculate_combination_value(resistors: Tuple[float], mode: str) -> float:
-    """Calculates the total resistance for a given combination."""
-    if not resistors: return 0
-    if mode == 'series': return sum(resistors)
-    if mode == 'parallel':
-        if any(r == 0 for r in resistors): return 0
-        return 1 / sum(1 / r for r in resistors)
-    return 0
-
-def find_combinations(target: float, tolerance: float, mode: str, num_resistors_option: Union[int, str]) -> Iterator[Tuple[float, ...]]:
-    """Finds all resistor combinations that meet the target criteria."""
-    search_space = [r for r in STANDARD_RESISTORS if r <= target * (1 + tolerance)] if mode == 'series' else STANDARD_RESISTORS
-    
-    if num_resistors_option == "Automatic":
-        count_range = range(1, MAX_RESISTORS_IN_COMBO + 1)
-    else:
-        count_range = range(int(num_resistors_option), int(num_resistors_option) + 1)
-
-    for i in count_range:
-        for combo in combinations_with_replacement(search_space, i):
-            total_resistance = calculate_combination_value(combo, mode)
-            if target > 0 and abs(total_resistance - target) / target <= tolerance:
-                yield combo
-
-def generate_circuit_dot(combo: Tuple[float, ...], mode: str, is_best: bool) -> str:
-    """Generates a Graphviz DOT string for the circuit diagram."""
-    border_color = "#00b4d8" if is_best else "#adb5bd"
-    node_color = "#ade8f4" if is_best else "#dee2e6"
-    theme_neutral_font_color = "#6c757d"
-    
-    dot_lines = [
-        'digraph G {',
-        '    rankdir=LR;',
-        '    bgcolor="transparent";',
-        f'   node [shape=box, style="filled", fillcolor="{node_color}", fontcolor="black", color="{border_color}", penwidth=1.5];',
-        f'   edge [color="{border_color}"];'
-    ]
-    
-    resistor_labels = {f'R{i+1}': format_resistance(val) for i, val in enumerate(combo)}
-    in_out_style = f'fontcolor="{theme_neutral_font_color}" style=plaintext'
-
-    if mode == 'series':
-        path = " -> ".join(resistor_labels.keys())
-        dot_lines.append(f'    "In" [{in_out_style}]; "Out" [{in_out_style}]; "In" -> {path} -> "Out";')
-    elif mode == 'parallel':
-        dot_lines.append(f'    In [shape=point, label=""]; Out [shape=point, label=""];')
-        for r_name in resistor_labels.keys():
-            dot_lines.append(f'    In -> {r_name} -> Out;')
-    
-    for r_name, r_label in resistor_labels.items():
-        dot_lines.append(f'    {r_name} [label="{r_label}", fontcolor="black"];')
-
-    dot_lines.append('}')
-    return "\n".join(dot_lines)
-
-def display_results_cards(results: List[Dict], mode: str):
+def display_results_cards(results: Dict[str, np.ndarray], mode: str):
     """Displays the result cards with correct layout and precision."""
-    if not results:
+    if not len(results['errors']):
         st.info(f"No suitable {mode} combinations were found.")
         return
 
-    for i, res in enumerate(results[:st.session_state.num_to_display]):
+    for i in range(min(st.session_state.num_to_display, len(results['errors']))):
         is_best = (i == 0)
+        sorted_combo, value, error = combo_values(results, i), results['values'][i], results['errors'][i]
         with st.container(border=True):
-            if is_best:
-                st.markdown("🏆 **Best Match**")
-            
             op_symbol = " + " if mode == 'series' else " || "
-            summary = op_symbol.join([format_resistance(r) for r in sorted(list(res['combo']))])
-            st.markdown(f"#### {summary}")
+            summary = op_symbol.join([format_resistance(r) for r in sorted_combo])
+            best_badge = "🏆 **Best Match**\n\n" if is_best else ""
+            st.markdown(f"{best_badge}#### {summary}")
 
             def show_metrics_and_breakdown(error_val, value_val, combo_val):
                 metric_cols = st.columns(2)
                 metric_cols[0].metric("Resulting Value", format_resistance(value_val))
                 metric_cols[1].metric("Error", f"{error_val:.5f}%")
                 
-                st.markdown("**Component Breakdown:**")
-                for r_val in sorted(list(combo_val)):
-                    comp_cols = st.columns([2, 1])
-                    with comp_cols[0]:
-                        st.markdown(f"<p style='font-size: 1.1em; text-align: left; margin-top: 10px;'>{format_resistance(r_val)}</p>", unsafe_allow_html=True)
-                    with comp_cols[1]:
-                        st.markdown(f"<div style='text-align: right;'>{color_bands_html(get_resistor_colors(r_val))}</div>", unsafe_allow_html=True)
-                    st.divider()
+                # One markdown element for the whole breakdown instead of columns + divider per resistor.
+                html_parts = ["<p><strong>Component Breakdown:</strong></p>", "<table style='width: 100%; border-collapse: collapse; border: none;'>"]
+                for r_val in combo_val:
+                    html_parts.append(
+                        "<tr style='border: none; border-bottom: 1px solid rgba(128, 128, 128, 0.3);'>"
+                        f"<td style='font-size: 1.1em; text-align: left; border: none; padding: 10px 0;'>{format_resistance(r_val)}</td>"
+                        f"<td style='text-align: right; border: none; padding: 10px 0;'>{color_bands_html(get_resistor_colors(r_val))}</td>"
+                        "</tr>"
+                    )
+                html_parts.append("</table>")
+                st.markdown("".join(html_parts), unsafe_allow_html=True)
 
             if mode == 'series':
-                st.graphviz_chart(generate_circuit_dot(res['combo'], mode, is_best), use_container_width=True)
+                st.graphviz_chart(generate_circuit_dot(sorted_combo, mode, is_best), use_container_width=True)
                 st.divider()
-                show_metrics_and_breakdown(res['error'], res['value'], res['combo'])
+                show_metrics_and_breakdown(error, value, sorted_combo)
             else: # mode == 'parallel'
                 main_cols = st.columns([2, 3])
                 with main_cols[0]:
-                    st.graphviz_chart(generate_circuit_dot(res['combo'], mode, is_best), use_container_width=True)
+                    st.graphviz_chart(generate_circuit_dot(sorted_combo, mode, is_best), use_container_width=True)
                 with main_cols[1]:
-                    show_metrics_and_breakdown(res['error'], res['value'], res['combo'])
+                    show_metrics_and_breakdown(error, value, sorted_combo)
 
-    if len(results) > st.session_state.num_to_display:
+    if st.session_state[f'{mode}_total'] > st.session_state.num_to_display:
         if st.button(f"Show More ({mode.title()})", key=f"more_{mode}", use_container_width=True):
             st.session_state.num_to_display += RESULTS_INCREMENT
+            if st.session_state.num_to_display > len(results['errors']):
+                load_results(*st.session_state.search_query, limit=None)
             st.rerun()
 
+@st.cache_data(show_spinner=False)
+def compute_all(target_val: float, tolerance: float, num_resistors_option: Union[int, str], limit: Optional[int] = MAX_RESULTS_CAP) -> Tuple[Tuple[Dict[str, np.ndarray], int], Tuple[Dict[str, np.ndarray], int]]:
+    """Runs the series and parallel searches; cached on the inputs so repeated queries are free."""
+    series_results = process_results(find_combinations(target_val, tolerance, 'series', num_resistors_option), 'series', target_val, limit)
+    parallel_results = process_results(find_combinations(target_val, tolerance, 'parallel', num_resistors_option), 'parallel', target_val, limit)
+    return series_results, parallel_results
+
+def load_results(target_val: float, tolerance: float, num_resistors_option: Union[int, str], limit: Optional[int] = MAX_RESULTS_CAP):
+    """Stores the (top-`limit`) results of a search and its total match counts in the session state."""
+    (st.session_state.series_results, st.session_state.series_total), (st.session_state.parallel_results, st.session_state.parallel_total) = compute_all(target_val, tolerance, num_resistors_option, limit)
+    st.session_state.search_query = (target_val, tolerance, num_resistors_option)
+
 # --- UI Layout (Main App Body) ---
 with st.sidebar:
     st.title("About & Settings")
@@ -212,24 +138,15 @@ with st.container(border=True):
             st.session_state.results_calculated = False
         else:
             with st.spinner("Calculating all possible combinations..."):
-                tolerance = tolerance_percent / 100
-                def process_results(combos: List, mode: str) -> List[Dict[str, Any]]:
-                    results = []
-                    for combo in set(combos):
-                        val = calculate_combination_value(combo, mode)
-                        error = abs(val - target_val) / target_val * 100
-                        results.append({"combo": combo, "value": val, "error": error})
-                    return sorted(results, key=lambda x: (x['error'], len(x['combo'])))
-                st.session_state.series_results = process_results(list(find_combinations(target_val, tolerance, 'series', num_resistors_option)), 'series')
-                st.session_state.parallel_results = process_results(list(find_combinations(target_val, tolerance, 'parallel', num_resistors_option)), 'parallel')
+                load_results(target_val, tolerance_percent / 100, num_resistors_option)
                 st.session_state.num_to_display = st.session_state.num_to_display_setting
                 st.session_state.results_calculated = True
 
 # --- Results Section ---
 if st.session_state.results_calculated:
     st.header("2. Calculation Results", divider='rainbow')
-    min_error_series = st.session_state.series_results[0]['error'] if st.session_state.series_results else float('inf')
-    min_error_parallel = st.session_state.parallel_results[0]['error'] if st.session_state.parallel_results else float('inf')
+    min_error_series = st.session_state.series_results['errors'][0] if st.session_state.series_total else float('inf')
+    min_error_parallel = st.session_state.parallel_results['errors'][0] if st.session_state.parallel_total else float('inf')
     
     st.markdown("##### Results Summary")
     
@@ -280,7 +197,7 @@ if st.session_state.results_calculated:
 
     st.divider()
 
-    tab_series, tab_parallel = st.tabs([f"**Series ({len(st.session_state.series_results)} combinations)**", f"**Parallel ({len(st.session_state.parallel_results)} combinations)**"])
+    tab_series, tab_parallel = st.tabs([f"**Series ({st.session_state.series_total} combinations)**", f"**Parallel ({st.session_state.parallel_total} combinations)**"])
 
     with tab_series:
         display_results_cards(st.session_state.series_results, 'series')
@@ -0,0 +1,71 @@
+"""Compiled per-k combination search kernels for the resistor calculator.
+
+These live outside app.py because Streamlit re-executes the main script on every rerun: as an imported
+module they are compiled (or loaded from Numba's on-disk cache) once per server process and then reused.
+"""
+import numpy as np
+from numba import njit
+
+@njit("int32[:, :](int32[:, :])", cache=True)
+def _grow_rows(out: np.ndarray) -> np.ndarray:
+    grown = np.empty((2 * out.shape[0], out.shape[1]), dtype=np.int32)
+    grown[:out.shape[0]] = out
+    return grown
+
+# Every per-k kernel shares one signature: (terms, 2R keys, pair_a, pair_b, first, last, win_lo, win_hi) -> index rows.
+# Series terms are the resistor values, parallel terms the scaled conductances; the window bounds their sum and
+# only resistors first..last-1 can take part in a match.
+_KERNEL_SIGNATURE = "int32[:, :](int64[::1], int64[::1], int32[::1], int32[::1], int64, int64, int64, int64)"
+
+@njit(_KERNEL_SIGNATURE, cache=True)
+def _find_k1(terms: np.ndarray, keys: np.ndarray, pair_a: np.ndarray, pair_b: np.ndarray, first: int, last: int, win_lo: int, win_hi: int) -> np.ndarray:
+    """Single resistors whose term lies in the window."""
+    out = np.empty((last - first, 1), dtype=np.int32)
+    count = 0
+    for i in range(first, last):
+        if win_lo <= terms[i] <= win_hi:
+            out[count, 0] = i
+            count += 1
+    return out[:count]
+
+@njit(_KERNEL_SIGNATURE, cache=True)
+def _find_k2(terms: np.ndarray, keys: np.ndarray, pair_a: np.ndarray, pair_b: np.ndarray, first: int, last: int, win_lo: int, win_hi: int) -> np.ndarray:
+    """Pairs are one contiguous slice of the sorted 2R buffer."""
+    j0 = np.searchsorted(keys, win_lo, side='left')
+    j1 = np.searchsorted(keys, win_hi, side='right')
+    out = np.empty((j1 - j0, 2), dtype=np.int32)
+    out[:, 0], out[:, 1] = pair_a[j0:j1], pair_b[j0:j1]
+    return out
+
+@njit(_KERNEL_SIGNATURE, cache=True)
+def _find_k3(terms: np.ndarray, keys: np.ndarray, pair_a: np.ndarray, pair_b: np.ndarray, first: int, last: int, win_lo: int, win_hi: int) -> np.ndarray:
+    """Pairs every single resistor with the 2R buffer entries that bring the total into the window."""
+    out = np.empty((1024, 3), dtype=np.int32)
+    count = 0
+    for i in range(first, last):
+        j0 = np.searchsorted(keys, win_lo - terms[i], side='left')
+        j1 = np.searchsorted(keys, win_hi - terms[i], side='right')
+        for j in range(j0, j1):
+            if pair_a[j] < i: continue
+            if count == out.shape[0]: out = _grow_rows(out)
+            out[count, 0], out[count, 1], out[count, 2] = i, pair_a[j], pair_b[j]
+            count += 1
+    return out[:count]
+
+@njit(_KERNEL_SIGNATURE, cache=True)
+def _find_k4(terms: np.ndarray, keys: np.ndarray, pair_a: np.ndarray, pair_b: np.ndarray, first: int, last: int, win_lo: int, win_hi: int) -> np.ndarray:
+    """Pairs 2R buffer entries (a, b) and (c, d) with b <= c whose keys sum into the window."""
+    out = np.empty((1024, 4), dtype=np.int32)
+    count = 0
+    for j in range(keys.shape[0]):
+        if keys[j] > win_hi: break
+        m0 = np.searchsorted(keys, win_lo - keys[j], side='left')
+        m1 = np.searchsorted(keys, win_hi - keys[j], side='right')
+        for m in range(m0, m1):
+            if pair_a[m] < pair_b[j]: continue
+            if count == out.shape[0]: out = _grow_rows(out)
+            out[count, 0], out[count, 1], out[count, 2], out[count, 3] = pair_a[j], pair_b[j], pair_a[m], pair_b[m]
+            count += 1
+    return out[:count]
+
+COMBO_KERNELS = {1: _find_k1, 2: _find_k2, 3: _find_k3, 4: _find_k4}
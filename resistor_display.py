@@ -0,0 +1,66 @@
+"""Formatting, color-band and circuit-diagram helpers for the resistor calculator's result cards.
+
+Kept out of app.py so the lru_caches below persist across Streamlit reruns rather than being rebuilt with each
+script run; the same standard values and top-ranked diagrams come back on every rerun.
+"""
+from functools import lru_cache
+from typing import Tuple, Iterable
+
+# Graphviz templates for the circuit diagrams; generate_circuit_dot only fills in colors, names and labels.
+_DOT_HEADER_TEMPLATE = (
+    'digraph G {{\n'
+    '    rankdir=LR;\n'
+    '    bgcolor="transparent";\n'
+    '   node [shape=box, style="filled", fillcolor="{node}", fontcolor="black", color="{border}", penwidth=1.5];\n'
+    '   edge [color="{border}"];\n'
+)
+_DOT_IN_OUT_STYLE = 'fontcolor="#6c757d" style=plaintext'
+_DOT_SERIES_BODY = f'    "In" [{_DOT_IN_OUT_STYLE}]; "Out" [{_DOT_IN_OUT_STYLE}]; "In" -> {{path}} -> "Out";\n'
+_DOT_PARALLEL_BODY = '    In [shape=point, label=""]; Out [shape=point, label=""];\n'
+_DOT_PARALLEL_BRANCH = '    In -> {name} -> Out;\n'
+_DOT_NODE = '    {name} [label="{label}", fontcolor="black"];\n'
+
+@lru_cache(maxsize=256)
+def format_resistance(value: float) -> str:
+    """Formats the resistance value with smart precision."""
+    if value >= 1_000_000:
+        val_str = f"{value / 1_000_000:.3f}".rstrip('0').rstrip('.')
+        return f"{val_str} MΩ"
+    if value >= 1_000:
+        val_str = f"{value / 1_000:.3f}".rstrip('0').rstrip('.')
+        return f"{val_str} kΩ"
+    return f"{int(value)} Ω"
+
+@lru_cache(maxsize=256)
+def get_resistor_colors(value: float) -> Tuple[str, ...]:
+    """Calculates the color bands for a given resistor value."""
+    COLOR_CODES = {0: 'black', 1: 'brown', 2: 'red', 3: 'orange', 4: 'yellow', 5: 'green', 6: 'blue', 7: 'purple', 8: 'gray', 9: 'white'}
+    if value == 0: return ('black', 'black', 'black')
+    try:
+        s_val = f"{value:.9E}"
+        parts = s_val.split('E')
+        mantissa_str, exponent = parts[0].replace('.', ''), int(parts[1])
+        d1, d2 = int(mantissa_str[0]), int(mantissa_str[1])
+        num_zeros = exponent - 1
+        return tuple(COLOR_CODES.get(d, 'black') for d in [d1, d2, num_zeros])
+    except (IndexError, ValueError): return ('black', 'black', 'black')
+
+def color_bands_html(colors: Iterable[str]) -> str:
+    """Generates HTML for displaying color bands."""
+    return "".join(f'<div style="background-color:{c}; width:15px; height:40px; display:inline-block; border:1.5px solid #333; margin-right:2px; border-radius: 4px; vertical-align: middle;"></div>' for c in colors)
+
+@lru_cache(maxsize=256)
+def generate_circuit_dot(combo: Tuple[float, ...], mode: str, is_best: bool) -> str:
+    """Generates a Graphviz DOT string for the circuit diagram."""
+    border_color = "#00b4d8" if is_best else "#adb5bd"
+    node_color = "#ade8f4" if is_best else "#dee2e6"
+    names = [f'R{i+1}' for i in range(len(combo))]
+
+    if mode == 'series':
+        body = _DOT_SERIES_BODY.format(path=" -> ".join(names))
+    elif mode == 'parallel':
+        body = _DOT_PARALLEL_BODY + "".join(_DOT_PARALLEL_BRANCH.format(name=name) for name in names)
+    else:
+        body = ""
+    nodes = "".join(_DOT_NODE.format(name=name, label=format_resistance(val)) for name, val in zip(names, combo))
+    return _DOT_HEADER_TEMPLATE.format(node=node_color, border=border_color) + body + nodes + "}"
@@ -0,0 +1,135 @@
+"""Exact standard-value search behind the resistor calculator: tables, tolerance windows and result ranking.
+
+Nothing here touches Streamlit, so the tables are built once when the module is first imported and the search can be
+exercised directly by the tests.
+"""
+import re
+import math
+from decimal import Decimal
+from fractions import Fraction
+from functools import reduce
+from typing import Tuple, Iterable, Iterator, Dict, Optional, Union
+
+import numpy as np
+
+from combo_kernels import COMBO_KERNELS
+
+E12_VALUES = [10, 12, 15, 18, 22, 27, 33, 39, 47, 56, 68, 82]
+_RESISTANCE_RE = re.compile(r"^\s*(\d*\.?\d+)\s*([kmg])?\s*$", re.IGNORECASE)
+
+MAX_RESISTORS_IN_COMBO = 4
+COMBO_INDEX_DTYPE = np.int8  # Results identify combos by indices into STANDARD_RESISTORS (-1 pads short combos).
+
+def build_standard_tables():
+    """Builds the standard resistor table and the search buffers derived from it, once per server process."""
+    resistors = sorted([j * 10**i for i in range(7) for j in E12_VALUES])
+    values = np.array(resistors, dtype=np.int64)
+    # Every standard value divides `scale`, so conductances scale/r are exact integers; the search never touches floats.
+    scale = reduce(lambda a, b: a * b // math.gcd(a, b), resistors)
+    conductances = np.array([scale // r for r in resistors], dtype=np.int64)
+    assert MAX_RESISTORS_IN_COMBO * int(conductances[0]) < np.iinfo(np.int64).max
+    assert len(resistors) <= np.iinfo(COMBO_INDEX_DTYPE).max
+
+    # Sorted 2-resistor buffers (pair key, index a, index b with a <= b), as in KiCad's RES_EQUIV_CALC.
+    # Series pairs are keyed by their sum, parallel pairs by their scaled conductance.
+    pair_a, pair_b = np.triu_indices(len(resistors))
+    def build_2r_buffer(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        order = np.argsort(keys, kind='stable')
+        return keys[order], pair_a[order].astype(np.int32), pair_b[order].astype(np.int32)
+
+    return (resistors, scale, values, conductances,
+            build_2r_buffer(values[pair_a] + values[pair_b]), build_2r_buffer(conductances[pair_a] + conductances[pair_b]))
+
+(STANDARD_RESISTORS, CONDUCTANCE_SCALE, STANDARD_VALUES, STANDARD_CONDUCTANCES,
+ BUFFER_2R_SERIES, BUFFER_2R_PARALLEL) = build_standard_tables()
+MAX_RESULTS_CAP = 50  # Matches the sidebar's max; "Show More" past this triggers a full sort.
+
+def parse_resistance(value: str) -> Optional[float]:
+    """Parses a resistance string (e.g., '4.7k') into a float."""
+    if not value: return None
+    match = _RESISTANCE_RE.match(value.strip())
+    if not match: return None
+    number_str, prefix = match.groups()
+    number = Decimal(number_str)  # Decimal keeps '4.7k' at exactly 4700 for the integer tolerance window.
+    PREFIXES = {"k": 10**3, "m": 10**6, "g": 10**9}
+    multiplier = PREFIXES.get(prefix.lower() if prefix else "", 1)
+    resistance = float(number * multiplier)
+    return resistance if math.isfinite(resistance) else None
+
+def _series_value(combos_idx: np.ndarray) -> np.ndarray:
+    """Total series resistance of each combination (rows of indices into STANDARD_RESISTORS)."""
+    return STANDARD_VALUES[combos_idx].sum(axis=1).astype(np.float64)
+
+def _parallel_value(combos_idx: np.ndarray) -> np.ndarray:
+    """Total parallel resistance of each combination (rows of indices into STANDARD_RESISTORS)."""
+    return CONDUCTANCE_SCALE / STANDARD_CONDUCTANCES[combos_idx].sum(axis=1)
+
+def combo_values(results: Dict[str, np.ndarray], i: int) -> Tuple[int, ...]:
+    """Returns the resistor values of the i-th result, ascending (kernel rows are sorted indices into the sorted table)."""
+    return tuple(np.take(STANDARD_VALUES, results['combos_idx'][i, :results['k'][i]]).tolist())
+
+def tolerance_window(target: float, tolerance: float, mode: str) -> Tuple[int, int]:
+    """Returns the exact integer [lo, hi] window on the series sum or the scaled parallel conductance."""
+    t, tol = Fraction(target), Fraction(tolerance).limit_denominator(10**6)
+    if mode == 'series':
+        lo, hi = math.ceil(t * (1 - tol)), math.floor(t * (1 + tol))
+    else:
+        lo, hi = math.ceil(CONDUCTANCE_SCALE / (t * (1 + tol))), math.floor(CONDUCTANCE_SCALE / (t * (1 - tol)))
+    int64_max = np.iinfo(np.int64).max
+    return min(lo, int64_max), min(hi, int64_max)
+
+def find_combinations(target: float, tolerance: float, mode: str, num_resistors_option: Union[int, str]) -> Iterator[np.ndarray]:
+    """Finds all resistor combinations that meet the target criteria, as one block of index rows per combo size."""
+    if target <= 0: return
+    win_lo, win_hi = tolerance_window(target, tolerance, mode)
+    if win_lo > win_hi: return
+    # Strictly increasing values are what make every emitted multiset unique (i0 <= i1 <= ...).
+    assert np.all(np.diff(STANDARD_VALUES) > 0), "search space must be sorted and free of duplicates"
+    terms, buffer_2r = (STANDARD_VALUES, BUFFER_2R_SERIES) if mode == 'series' else (STANDARD_CONDUCTANCES, BUFFER_2R_PARALLEL)
+    # Terms are positive, so a resistor whose own term exceeds win_hi can't be in any match. For series that is
+    # r <= target*(1+tol); for parallel it is the lower bound r >= target*(1-tol), since a parallel combination is
+    # always below its smallest resistor. Terms are monotonic in the index, so the eligible resistors are one run.
+    eligible = np.flatnonzero(terms <= win_hi)
+    if not len(eligible): return
+    first, last = eligible[0], eligible[-1] + 1
+    
+    if num_resistors_option == "Automatic":
+        count_range = range(1, MAX_RESISTORS_IN_COMBO + 1)
+    else:
+        count_range = range(int(num_resistors_option), int(num_resistors_option) + 1)
+
+    for i in count_range:
+        yield COMBO_KERNELS[i](terms, *buffer_2r, first, last, win_lo, win_hi)
+
+def rank_results(errors: np.ndarray, ks: np.ndarray, limit: Optional[int]) -> np.ndarray:
+    """Returns the indices of the best `limit` rows by (error, count), in order."""
+    candidates = np.arange(len(errors))
+    if limit is not None and limit < len(errors):
+        # Partition on error first, keeping every tie with the cut-off so the (error, count) order stays exact.
+        cutoff = np.partition(errors, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(errors <= cutoff)
+    return candidates[np.lexsort((ks[candidates], errors[candidates]))][:limit]
+
+def process_results(combos_iter: Iterable[np.ndarray], mode: str, target: float, limit: Optional[int] = MAX_RESULTS_CAP) -> Tuple[Dict[str, np.ndarray], int]:
+    """Evaluates the (already unique) combination blocks as they stream in; returns the best `limit` by (error, count) and the total match count."""
+    combos_idx = [np.empty((0, MAX_RESISTORS_IN_COMBO), dtype=COMBO_INDEX_DTYPE)]
+    ks, values, errors = [np.empty(0, dtype=np.int8)], [np.empty(0)], [np.empty(0)]
+    total = 0
+    calc = _series_value if mode == 'series' else _parallel_value
+    for block in combos_iter:
+        # Each block is cut down to its own best `limit` rows right away, so only a few rows per combo size are kept.
+        total += len(block)
+        block_values = calc(block)
+        block_errors = np.abs(block_values - target) / target * 100
+        block_ks = np.full(len(block), block.shape[1], dtype=np.int8)
+        keep = rank_results(block_errors, block_ks, limit)
+        padded = np.full((len(keep), MAX_RESISTORS_IN_COMBO), -1, dtype=COMBO_INDEX_DTYPE)
+        padded[:, :block.shape[1]] = block[keep]
+        combos_idx.append(padded)
+        ks.append(block_ks[keep])
+        values.append(block_values[keep])
+        errors.append(block_errors[keep])
+    combos_idx, ks, values, errors = np.concatenate(combos_idx), np.concatenate(ks), np.concatenate(values), np.concatenate(errors)
+
+    order = rank_results(errors, ks, limit)
+    return {'combos_idx': combos_idx[order], 'k': ks[order], 'values': values[order], 'errors': errors[order]}, total
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app is a flat Streamlit script rather than a package, so make its top-level modules importable.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,84 @@
+"""Checks the exact standard-value search against a Fraction brute force over every standard-value multiset."""
+from fractions import Fraction
+from functools import lru_cache
+from itertools import combinations_with_replacement
+
+import numpy as np
+import pytest
+
+from resistor_search import (STANDARD_RESISTORS, STANDARD_VALUES, MAX_RESISTORS_IN_COMBO, parse_resistance,
+                             tolerance_window, find_combinations, rank_results, process_results)
+
+TARGETS = [7.0, 330.0, 4700.0, 5000.0, 10000.0, 1.23e6, 1e8]
+TOLERANCE_PERCENTS = ['0', '0.1', '1', '5', '20']  # As the sidebar slider gives them, before the app divides by 100.
+
+@lru_cache(maxsize=None)
+def _all_combos(k):
+    return np.array(list(combinations_with_replacement(range(len(STANDARD_RESISTORS)), k)), dtype=np.int32).reshape(-1, k)
+
+def _exact_value(combo, mode):
+    if mode == 'series':
+        return Fraction(sum(STANDARD_RESISTORS[i] for i in combo))
+    return 1 / sum(Fraction(1, STANDARD_RESISTORS[i]) for i in combo)
+
+def brute_force(target, tol_percent, mode, k):
+    """Every k-multiset whose exact value lies within tol_percent of target, as sorted index tuples."""
+    t, tol = Fraction(target), Fraction(tol_percent) / 100
+    combos = _all_combos(k)
+    vals = STANDARD_VALUES[combos].astype(np.float64)
+    approx = vals.sum(axis=1) if mode == 'series' else 1 / (1 / vals).sum(axis=1)
+    # Float prefilter with a generous margin, then the exact Fraction check decides.
+    near = np.abs(approx - target) <= target * (float(tol) + 1e-6)
+    return {c for c in map(tuple, combos[near].tolist()) if abs(_exact_value(c, mode) - t) <= tol * t}
+
+def search(target, tol_percent, mode, option):
+    return [tuple(row) for block in find_combinations(target, float(tol_percent) / 100, mode, option) for row in block.tolist()]
+
+@pytest.mark.parametrize('k', [1, 2, 3, 4])
+@pytest.mark.parametrize('mode', ['series', 'parallel'])
+@pytest.mark.parametrize('tol_percent', TOLERANCE_PERCENTS)
+@pytest.mark.parametrize('target', TARGETS, ids=str)
+def test_search_matches_brute_force(target, tol_percent, mode, k):
+    rows = search(target, tol_percent, mode, k)
+    assert len(set(rows)) == len(rows), "duplicate combinations"
+    assert set(rows) == brute_force(target, tol_percent, mode, k)
+
+@pytest.mark.parametrize('mode, target, tol_percent, combo', [
+    ('series', 10000.0, '0.1', (10, 10000)),         # 10010 is exactly 10k + 0.1%
+    ('series', 10000.0, '0.1', (10, 1800, 8200)),
+    ('parallel', 5000.0, '0', (10000, 10000)),       # exactly 5k, found at 0% tolerance
+])
+def test_exact_edge_is_included(mode, target, tol_percent, combo):
+    rows = search(target, tol_percent, mode, len(combo))
+    assert tuple(STANDARD_RESISTORS.index(r) for r in combo) in rows
+
+def test_window_is_clamped_to_int64():
+    # A tiny parallel target needs a conductance beyond int64; the window saturates and simply matches nothing.
+    lo, hi = tolerance_window(1e-12, 0.01, 'parallel')
+    assert lo == hi == np.iinfo(np.int64).max
+    assert search(1e-12, '1', 'parallel', 'Automatic') == []
+
+def test_rank_results_keeps_ties_at_the_cutoff():
+    # Three rows tie on error at the cut-off; the one with the fewest resistors must win the last slot.
+    errors = np.array([0.5, 0.5, 0.1, 0.5, 2.0])
+    ks = np.array([3, 4, 4, 1, 1], dtype=np.int8)
+    assert rank_results(errors, ks, 2).tolist() == [2, 3]
+    assert rank_results(errors, ks, None).tolist() == [2, 3, 0, 1, 4]
+
+@pytest.mark.parametrize('mode', ['series', 'parallel'])
+def test_process_results_keeps_the_best_and_counts_all(mode):
+    target, tol_percent, limit = 10000.0, '1', 20
+    results, total = process_results(find_combinations(target, 0.01, mode, 'Automatic'), mode, target, limit)
+    expected = [c for k in range(1, MAX_RESISTORS_IN_COMBO + 1) for c in brute_force(target, tol_percent, mode, k)]
+    assert total == len(expected)
+    best = sorted((float(abs(_exact_value(c, mode) - Fraction(target)) / Fraction(target) * 100), len(c)) for c in expected)[:limit]
+    assert np.allclose(results['errors'], [e for e, _ in best], rtol=0, atol=1e-9)
+    assert results['k'].tolist() == [k for _, k in best]
+
+def test_parse_resistance():
+    assert parse_resistance('4.7k') == 4700
+    assert parse_resistance(' 330 ') == 330
+    assert parse_resistance('1.23M') == 1230000
+    assert parse_resistance('abc') is None
+    assert parse_resistance('') is None
+    assert parse_resistance('9' * 400) is None  # would otherwise parse to inf